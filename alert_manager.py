@@ -1,43 +1,151 @@
 import time
-from typing import Dict, Set, List, Tuple
-from dataclasses import dataclass
+import numpy as np
+import shapely
+from numba import njit
+from typing import Dict, Set, List, Tuple, Optional, Hashable
 from config import Config
 
 
-@dataclass
-class Alert:
-    track_id: int
-    zone_id: int
-    entry_time: float
-    last_seen_in_zone: float
-    is_active: bool = True
+@njit(cache=True, fastmath=True)
+def _point_in_poly(x: float, y: float, px: np.ndarray, py: np.ndarray) -> bool:
+    """Winding number test against polygon vertex arrays px, py, without divisions.
+    Points on an edge count as inside"""
+    n = px.shape[0]
+    wn = 0
+    on_edge = False
+    for i in range(n):
+        j = i + 1 if i < n - 1 else 0
+        # > 0 if point is left of the edge from vertex i to vertex j
+        left = (px[j] - px[i]) * (y - py[i]) - (x - px[i]) * (py[j] - py[i])
+        wn += int((py[i] <= y) & (py[j] > y) & (left > 0)) - \
+            int((py[i] > y) & (py[j] <= y) & (left < 0))
+        on_edge |= (left == 0) & \
+            (min(px[i], px[j]) <= x) & (x <= max(px[i], px[j])) & \
+            (min(py[i], py[j]) <= y) & (y <= max(py[i], py[j]))
+    return on_edge | (wn != 0)
+
+
+@njit(cache=True)
+def _first_zones(centers: np.ndarray, point_ids: np.ndarray, zone_ids: np.ndarray,
+                 zone_offsets: np.ndarray, zone_xy: np.ndarray) -> np.ndarray:
+    """Get id of the first zone containing each point, or -1 if there is none,
+    testing only the (point, zone) candidate pairs"""
+    result = np.full(centers.shape[0], -1, dtype=np.int64)
+    for k in range(point_ids.shape[0]):
+        p = point_ids[k]
+        zone_id = zone_ids[k]
+        if result[p] != -1 and result[p] < zone_id:
+            continue
+        start = zone_offsets[zone_id]
+        end = zone_offsets[zone_id + 1]
+        if _point_in_poly(centers[p, 0], centers[p, 1],
+                          zone_xy[start:end, 0], zone_xy[start:end, 1]):
+            result[p] = zone_id
+    return result
 
 
 class AlertManager:
-    def __init__(self):
-        self.active_alerts: Dict[int, Alert] = {}
+    def __init__(self, alert_capacity: int = 16):
+        # Alert state is kept in arrays indexed by slot, slots of removed
+        # alerts are reused and the arrays grow by doubling when full
+        self._alert_slots: Dict[int, int] = {}
+        self._free_slots: List[int] = []
+        self._n_slots = 0
+        self._slot_track_ids: List[Optional[Hashable]] = [None] * alert_capacity
+        self._used = np.zeros(alert_capacity, dtype=np.bool_)
+        self._zone_id = np.zeros(alert_capacity, dtype=np.int32)
+        self._entry_time = np.zeros(alert_capacity, dtype=np.float64)
+        self._last_seen = np.zeros(alert_capacity, dtype=np.float64)
+        self._active = np.zeros(alert_capacity, dtype=np.bool_)
+
         self.track_positions: Dict[int, Tuple[float, float]] = {}
 
+        # Timestamp of the last processed frame
+        self._now: float = time.time()
+
+        # Containers reused by update_alerts on every frame
+        self._active_ids_buf: Set[int] = set()
+        self._to_remove_buf: List[int] = []
+
+        # Zone geometry arrays, rebuilt when a different zones list is passed
+        self._zones_np: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._zone_xy = np.zeros((0, 2), dtype=np.float64)
+        self._zone_offsets = np.zeros(1, dtype=np.int64)
+        self._zone_geoms = np.empty(0, dtype=object)
+        self._rtree = shapely.STRtree([])
+        self._zones_src = None
+
+        # Compile the point in polygon kernels now to avoid a stall on the first frame
+        _point_in_poly(0.0, 0.0, np.zeros(3), np.zeros(3))
+        _first_zones(np.zeros((1, 2)), np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64),
+                     np.array([0, 3], dtype=np.int64), np.zeros((3, 2)))
+
+    def _prepare_zones(self, zones: List[List[Tuple[int, int]]]):
+        """Build vertex arrays and polygon geometries for zones"""
+        if zones is self._zones_src:
+            return
+
+        self._zones_np = Config.zones_to_soa(zones)
+        sizes = [len(px) for px, _ in self._zones_np]
+        self._zone_offsets = np.zeros(len(zones) + 1, dtype=np.int64)
+        self._zone_offsets[1:] = np.cumsum(sizes)
+        self._zone_xy = np.zeros((self._zone_offsets[-1], 2), dtype=np.float64)
+        for zone_id, (px, py) in enumerate(self._zones_np):
+            start, end = self._zone_offsets[zone_id], self._zone_offsets[zone_id + 1]
+            self._zone_xy[start:end, 0] = px
+            self._zone_xy[start:end, 1] = py
+
+        # Build all zone polygons in one call from the flat vertex array
+        if len(zones) > 0:
+            rings = shapely.linearrings(
+                self._zone_xy, indices=np.repeat(np.arange(len(zones)), sizes))
+            self._zone_geoms = shapely.polygons(rings)
+        else:
+            self._zone_geoms = np.empty(0, dtype=object)
+        self._rtree = shapely.STRtree(self._zone_geoms)
+        self._zones_src = zones
+
+    def _add_alert(self, track_id: int, zone_id: int, current_time: float) -> int:
+        """Store a new alert in a free slot and return the slot"""
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self._n_slots == len(self._used):
+                self._grow_alerts()
+            slot = self._n_slots
+            self._n_slots += 1
+
+        self._alert_slots[track_id] = slot
+        self._slot_track_ids[slot] = track_id
+        self._used[slot] = True
+        self._zone_id[slot] = zone_id
+        self._entry_time[slot] = current_time
+        self._last_seen[slot] = current_time
+        self._active[slot] = True
+        return slot
+
+    def _grow_alerts(self):
+        """Double the capacity of alert arrays"""
+        capacity = max(1, 2 * len(self._used))
+        self._slot_track_ids.extend([None] * (capacity - len(self._slot_track_ids)))
+        for name in ('_used', '_zone_id', '_entry_time', '_last_seen', '_active'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _remove_alert(self, slot: int):
+        """Free the slot of an alert"""
+        del self._alert_slots[self._slot_track_ids[slot]]
+        self._slot_track_ids[slot] = None
+        self._used[slot] = False
+        self._free_slots.append(slot)
+
     def check_point_in_polygon(self, point: Tuple[float, float], polygon: List[Tuple[int, int]]) -> bool:
-        """Check if a point is inside a polygon using ray casting algorithm"""
+        """Check if a point is inside a polygon using winding number algorithm"""
         x, y = point
-        n = len(polygon)
-        inside = False
-
-        p1x, p1y = polygon[0]
-        for i in range(1, n + 1):
-            p2x, p2y = polygon[i % n]
-            if y > min(p1y, p2y):
-                if y <= max(p1y, p2y):
-                    if x <= max(p1x, p2x):
-                        if p1y != p2y:
-                            xinters = (y - p1y) * (p2x - p1x) / \
-                                (p2y - p1y) + p1x
-                        if p1x == p2x or x <= xinters:
-                            inside = not inside
-            p1x, p1y = p2x, p2y
-
-        return inside
+        px, py = Config.zones_to_soa([polygon])[0]
+        return _point_in_poly(float(x), float(y), px, py)
 
     def get_bbox_center(self, bbox: Tuple[float, float, float, float]) -> Tuple[float, float]:
         """Get center point of bounding box"""
@@ -52,105 +160,101 @@ class AlertManager:
         center_point = self.get_bbox_center(bbox)
         self.track_positions[track_id] = center_point
 
-        for zone_id, zone in enumerate(zones):
-            if self.check_point_in_polygon(center_point, zone):
+        self._prepare_zones(zones)
+        x, y = center_point
+
+        # Only zones whose bounding box contains the point are tested exactly,
+        # in zone order so that the first containing zone is reported
+        candidates = np.sort(self._rtree.query(shapely.Point(x, y)))
+        for zone_id in candidates.tolist():
+            px, py = self._zones_np[zone_id]
+            if _point_in_poly(float(x), float(y), px, py):
                 return True, zone_id
 
         return False, -1
 
-    def update_alerts(self, tracks: List[Dict], zones: List[List[Tuple[int, int]]]) -> Set[int]:
-        """Update alerts based on current tracks and zones"""
-        current_time = time.time()
-        active_track_ids = set(track['track_id'] for track in tracks)
-        current_zone_occupancy = {}
+    def update_alerts(self, tracks: List[Dict], zones: List[List[Tuple[int, int]]],
+                      now: float = None) -> Set[int]:
+        """Update alerts based on current tracks and zones at frame time now"""
+        current_time = now if now is not None else time.time()
+        self._now = current_time
+        active_track_ids = self._active_ids_buf
+        active_track_ids.clear()
+        active_track_ids.update(track['track_id'] for track in tracks)
+        positions_to_remove = self._to_remove_buf
+        positions_to_remove.clear()
 
-        # Check for new zone penetrations
-        for track in tracks:
-            track_id = track['track_id']
-            bbox = track['bbox']
+        # Check all track centers against all zones at once
+        self._prepare_zones(zones)
+        centers = np.zeros((len(tracks), 2), dtype=np.float64)
+        for i, track in enumerate(tracks):
+            center_point = self.get_bbox_center(track['bbox'])
+            self.track_positions[track['track_id']] = center_point
+            centers[i] = center_point
 
-            # Check if center point is in any zone
-            penetrated, zone_id = self.check_zone_penetration(
-                track_id, bbox, zones)
+        # Get zones whose bounding box contains each center from the zone index
+        # in one query, then test only those pairs exactly, with the same
+        # kernel as check_zone_penetration
+        track_zone_ids = np.full(len(tracks), -1, dtype=np.int64)
+        if len(tracks) > 0 and len(self._zone_geoms) > 0:
+            point_ids, zone_ids = self._rtree.query(shapely.points(centers))
+            track_zone_ids = _first_zones(
+                centers, point_ids, zone_ids, self._zone_offsets, self._zone_xy)
 
-            if penetrated:
-                if zone_id not in current_zone_occupancy:
-                    current_zone_occupancy[zone_id] = set()
-                current_zone_occupancy[zone_id].add(track_id)
+        # Check for new zone penetrations and tracks that left zones
+        for track, zone_id in zip(tracks, track_zone_ids.tolist()):
+            track_id = track['track_id']
+            slot = self._alert_slots.get(track_id)
 
+            if zone_id >= 0:
                 # Create new alert or update existing one
-                if track_id not in self.active_alerts:
-                    self.active_alerts[track_id] = Alert(
-                        track_id=track_id,
-                        zone_id=zone_id,
-                        entry_time=current_time,
-                        last_seen_in_zone=current_time,
-                        is_active=True
-                    )
+                if slot is None:
+                    self._add_alert(track_id, zone_id, current_time)
                 else:
                     # Update existing alert - still in zone
-                    self.active_alerts[track_id].last_seen_in_zone = current_time
-                    self.active_alerts[track_id].is_active = True
+                    self._last_seen[slot] = current_time
+                    self._active[slot] = True
+            elif slot is not None:
+                # Track left the zone - keep alarm active until duration expires
+                self._active[slot] = False
 
-        # Handle tracks that left zones or disappeared
-        alerts_to_remove = []
-        for track_id, alert in self.active_alerts.items():
-            if track_id not in active_track_ids:
-                # Track disappeared - check if alarm duration expired
-                time_since_last_seen = current_time - alert.last_seen_in_zone
-                if time_since_last_seen >= Config.ALARM_DURATION:
-                    alerts_to_remove.append(track_id)
-            else:
-                # Track is still active
-                current_track = next(
-                    (t for t in tracks if t['track_id'] == track_id), None)
-                if current_track:
-                    penetrated, _ = self.check_zone_penetration(
-                        track_id, current_track['bbox'], zones)
-                    if not penetrated:
-                        # Track left the zone - update last seen time but keep alarm active
-                        alert.is_active = False
-
-                        # Check if alarm duration expired since leaving zone
-                        if track_id in self.track_positions:
-                            # Use current time for time calculation
-                            time_since_left = current_time - alert.last_seen_in_zone
-                            if time_since_left >= Config.ALARM_DURATION:
-                                alerts_to_remove.append(track_id)
-
-        # Remove expired alerts
-        for track_id in alerts_to_remove:
-            if track_id in self.active_alerts:
-                del self.active_alerts[track_id]
+        # Remove alerts of tracks that left zones or disappeared once alarm
+        # duration expired, tracks still in a zone were seen at current_time
+        n = self._n_slots
+        expired = self._used[:n] & (
+            (current_time - self._last_seen[:n]) >= Config.ALARM_DURATION)
+        for slot in np.nonzero(expired)[0].tolist():
+            track_id = self._slot_track_ids[slot]
+            self._remove_alert(slot)
             if track_id in self.track_positions:
                 del self.track_positions[track_id]
 
         # Clean up positions for disappeared tracks
-        disappeared_tracks = set(
-            self.track_positions.keys()) - active_track_ids
-        for track_id in disappeared_tracks:
-            if track_id in self.track_positions:
-                del self.track_positions[track_id]
+        for track_id in self.track_positions:
+            if track_id not in active_track_ids:
+                positions_to_remove.append(track_id)
+        for track_id in positions_to_remove:
+            del self.track_positions[track_id]
 
-        return set(self.active_alerts.keys())
+        return set(self._alert_slots.keys())
 
     def get_alerted_tracks(self) -> Set[int]:
         """Get all tracks with active alarms"""
-        return set(self.active_alerts.keys())
+        return set(self._alert_slots.keys())
 
-    def get_alert_status(self, track_id: int) -> Tuple[bool, float]:
-        """Get alarm status and time remaining for a track"""
-        if track_id not in self.active_alerts:
+    def get_alert_status(self, track_id: int, now: float = None) -> Tuple[bool, float]:
+        """Get alarm status and time remaining for a track at time now (last frame time by default)"""
+        slot = self._alert_slots.get(track_id)
+        if slot is None:
             return False, 0
 
-        alert = self.active_alerts[track_id]
-        current_time = time.time()
+        current_time = now if now is not None else self._now
 
-        if alert.is_active:
+        if self._active[slot]:
             return True, 0  # Still in zone, alarm continues indefinitely
 
         # Calculate time remaining for alarm after leaving zone
-        time_since_left = current_time - alert.last_seen_in_zone
+        time_since_left = current_time - float(self._last_seen[slot])
         time_remaining = max(0, Config.ALARM_DURATION - time_since_left)
 
         return time_remaining > 0, time_remaining
@@ -170,7 +274,7 @@ class AlertManager:
         #             active_after_leave += 1
 
         return {
-            'total_alerts': len(self.active_alerts),
+            'total_alerts': len(self._alert_slots),
             # 'active_in_zone': active_in_zone,
             # 'active_after_leave': active_after_leave,
             # 'track_positions': len(self.track_positions)
@@ -1,15 +1,20 @@
 import cv2
 import json
 import torch
+import numpy as np
 from typing import List, Tuple
 
 
 class Config:
     # YOLO model configuration
     YOLO_MODEL = "yolov8l.pt"
+    # TensorRT engine used instead of YOLO_MODEL when it exists (see --export-engine)
+    YOLO_ENGINE = "yolov8l.engine"
+    YOLO_INT8 = True
+    INT8_CALIBRATION_FRAMES = 200
     CONFIDENCE_THRESHOLD = 0.5
     IOU_THRESHOLD = 0.5
-    IMG_SIZE = 640
+    IMG_SIZE = 640  # 512 lowers latency at some cost in accuracy
 
     # DeepSORT configuration
     MAX_AGE = 30
@@ -21,6 +26,10 @@ class Config:
     USE_HALF_PRECISION = True
     USE_CUDA = torch.cuda.is_available()
 
+    # Live sources (camera index, rtsp/rtmp stream)
+    LIVE_BUFFER_SIZE = 1
+    LIVE_MAX_DROPPED_FRAMES = 30  # buffered frames skipped per read at most
+
     # Alert configuration
     ALARM_DURATION = 3  # seconds after leaving zone
     ALARM_COLOR = (0, 0, 255)  # red
@@ -33,17 +42,47 @@ class Config:
     FONT = cv2.FONT_HERSHEY_SIMPLEX
     FONT_SCALE = 0.7
 
-    @staticmethod
-    def load_zones() -> List[List[Tuple[int, int]]]:
+    # int32 vertex arrays of the last loaded or saved zones, used for drawing
+    _zones = None
+    _zone_polys_np: List[np.ndarray] = []
+
+    @classmethod
+    def load_zones(cls) -> List[List[Tuple[int, int]]]:
         try:
             with open('restricted_zones.json', 'r') as f:
                 data = json.load(f)
-                return [zone for zone in data.get('zones', [])]
+                zones = [zone for zone in data.get('zones', [])]
         except FileNotFoundError:
-            return []
+            zones = []
+        cls._cache_zone_polys(zones)
+        return zones
+
+    @classmethod
+    def _cache_zone_polys(cls, zones: List[List[Tuple[int, int]]]):
+        cls._zones = zones
+        cls._zone_polys_np = [np.asarray(zone, dtype=np.int32).reshape(-1, 2)
+                              for zone in zones]
+
+    @classmethod
+    def get_zone_polys_np(cls, zones: List[List[Tuple[int, int]]]) -> List[np.ndarray]:
+        """Get int32 vertex arrays of zones, cached for the last loaded or saved zones"""
+        if zones is cls._zones:
+            return cls._zone_polys_np
+        return [np.asarray(zone, dtype=np.int32).reshape(-1, 2) for zone in zones]
 
     @staticmethod
-    def save_zones(zones: List[List[Tuple[int, int]]]):
+    def zones_to_soa(zones: List[List[Tuple[int, int]]]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Convert zones to contiguous float64 x and y vertex arrays"""
+        soa = []
+        for zone in zones:
+            xy = np.asarray(zone, dtype=np.float64).reshape(-1, 2)
+            soa.append((np.ascontiguousarray(xy[:, 0]),
+                        np.ascontiguousarray(xy[:, 1])))
+        return soa
+
+    @classmethod
+    def save_zones(cls, zones: List[List[Tuple[int, int]]]):
         data = {'zones': zones}
         with open('restricted_zones.json', 'w') as f:
             json.dump(data, f, indent=2)
+        cls._cache_zone_polys(zones)
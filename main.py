@@ -1,8 +1,11 @@
 import numpy as np
 import cv2
+import time
+import queue
 import argparse
+import threading
 from zone_marker import ZoneMarker
-from tracker import PersonTracker, Visualization
+from tracker import PersonTracker, Visualization, export_engine
 from alert_manager import AlertManager
 from config import Config
 from typing import Set
@@ -14,6 +17,15 @@ class RestrictedZoneMonitor:
         self.tracker = PersonTracker()
         self.alert_manager = AlertManager()
         self.zones = []
+        self._zone_overlay = None
+        self.window_name = "Restricted Zone Monitoring. Press 'q' or Esc to quit, 'p' to pause, 's' to save image"
+
+        # Frames are processed on a worker thread and shown on the main thread,
+        # which HighGUI requires on some platforms
+        self._display_q = queue.Queue(maxsize=1)
+        self._quit = threading.Event()
+        self._resume = threading.Event()
+        self._alerted_tracks: Set[int] = set()
 
     def load_zones(self):
         """Load restricted zones from configuration"""
@@ -36,6 +48,85 @@ class RestrictedZoneMonitor:
             cv2.rectangle(
                 frame, (0, 0), (frame.shape[1], frame.shape[0]), Config.ALARM_COLOR, 10)
 
+    def _process_frames(self, cap: cv2.VideoCapture, out, live: bool, frame_interval: float):
+        """Capture, analyze and draw frames, handing them over to the display"""
+        frame_count = 0
+        try:
+            while not self._quit.is_set():
+                # Wait while paused
+                if not self._resume.wait(timeout=0.1):
+                    continue
+
+                if live:
+                    ret, frame = self.read_latest_frame(cap, frame_interval)
+                else:
+                    ret, frame = cap.read()
+                if not ret:
+                    break
+
+                frame_count += 1
+                frame_time = time.time()
+
+                # Track people in frame
+                tracks = self.tracker.detect_and_track(frame)
+
+                # Check for zone violations and get alerted tracks
+                alerted_tracks = self.alert_manager.update_alerts(
+                    tracks, self.zones, now=frame_time)
+                self._alerted_tracks = alerted_tracks
+
+                # Visualize results, zones are static so they are rasterized once
+                if self._zone_overlay is None:
+                    self._zone_overlay = Visualization.render_zone_overlay(
+                        frame.shape, self.zones)
+                Visualization.apply_zone_overlay(frame, self._zone_overlay)
+                Visualization.draw_tracks(
+                    frame, tracks, self.alert_manager, now=frame_time)
+                Visualization.draw_alarm_status(frame, self.alert_manager)
+
+                # Additional visualization using alerted_tracks directly
+                self.draw_additional_alerts(frame, alerted_tracks)
+
+                # Write frame to output
+                if out:
+                    out.write(frame)
+
+                self._show_frame(frame)
+        finally:
+            # End of video or an error stops the display loop too
+            self._quit.set()
+
+    def _show_frame(self, frame: np.ndarray):
+        """Hand frame to the display loop, replacing one not shown yet"""
+        try:
+            self._display_q.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self._display_q.put_nowait(frame)
+        except queue.Full:
+            pass
+
+    @staticmethod
+    def is_live_source(video_source: str) -> bool:
+        """Check if video source is a camera or an rtsp/rtmp stream"""
+        # http(s) sources are not detected as live, they are often plain video
+        # files which would lose almost every frame to the stale frame drain
+        return video_source.isdigit() or \
+            video_source.lower().startswith(('rtsp://', 'rtmp://'))
+
+    @staticmethod
+    def read_latest_frame(cap: cv2.VideoCapture, frame_interval: float):
+        """Read the newest frame, dropping frames buffered while the previous one was processed"""
+        for _ in range(Config.LIVE_MAX_DROPPED_FRAMES):
+            start = time.perf_counter()
+            if not cap.grab():
+                return False, None
+            # A buffered frame is returned at once, a fresh one has to be waited for
+            if time.perf_counter() - start > frame_interval / 2:
+                break
+        return cap.retrieve()
+
     def process_video(self, video_source: str, output_path: str = None):
         """Process video stream for intrusion detection"""
         if not self.load_zones():
@@ -46,10 +137,15 @@ class RestrictedZoneMonitor:
             print(f"Error: Could not open video source {video_source}")
             return
 
+        live = self.is_live_source(video_source)
+        if live:
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, Config.LIVE_BUFFER_SIZE)
+
         # Get video properties
         fps = int(cap.get(cv2.CAP_PROP_FPS))
         width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        frame_interval = 1 / fps if fps > 0 else 0
 
         # Setup video writer if output path is provided
         if output_path:
@@ -62,55 +158,48 @@ class RestrictedZoneMonitor:
         print("Press 'q' or Esc to quit, 'p' to pause, 's' to save image")
 
         paused = False
-        frame_count = 0
-
-        while True:
-            if not paused:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-
-                frame_count += 1
-
-                # Track people in frame
-                tracks = self.tracker.detect_and_track(frame)
-
-                # Check for zone violations and get alerted tracks
-                alerted_tracks = self.alert_manager.update_alerts(
-                    tracks, self.zones)
-
-                # Visualize results
-                Visualization.draw_zones(frame, self.zones)
-                Visualization.draw_tracks(frame, tracks, self.alert_manager)
-                Visualization.draw_alarm_status(frame, self.alert_manager)
-
-                # Additional visualization using alerted_tracks directly
-                self.draw_additional_alerts(frame, alerted_tracks)
-
-                # Write frame to output
-                if out:
-                    out.write(frame)
-
-                cv2.imshow(
-                    "Restricted Zone Monitoring. Press 'q' or Esc to quit, 'p' to pause, 's' to save image", frame)
-
-            key = cv2.waitKey(1 if not paused else 0) & 0xFF
+        frame = None
+        self._zone_overlay = None
+        self._alerted_tracks = set()
+
+        self._quit.clear()
+        self._resume.set()
+        worker = threading.Thread(
+            target=self._process_frames, args=(cap, out, live, frame_interval), daemon=True)
+        worker.start()
+
+        while not self._quit.is_set():
+            # Show the newest processed frame
+            try:
+                frame = self._display_q.get(timeout=0.01)
+                cv2.imshow(self.window_name, frame)
+            except queue.Empty:
+                pass
+
+            key = cv2.waitKey(1) & 0xFF
 
             if key == ord('q') or key == 27:
                 break
             elif key == ord('p'):
                 paused = not paused
+                if paused:
+                    self._resume.clear()
+                else:
+                    self._resume.set()
                 status = "Paused" if paused else "Resumed"
                 print(status)
                 # Show current alert status when pausing
-                if paused and alerted_tracks:
-                    print(f"Current alerts: {list(alerted_tracks)}")
-            elif key == ord('s'):
+                if paused and self._alerted_tracks:
+                    print(f"Current alerts: {list(self._alerted_tracks)}")
+            elif key == ord('s') and frame is not None:
                 # Save current frame with alerts
                 filename = f"alert_frame_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.jpg"
                 cv2.imwrite(filename, frame)
                 print(f"Frame saved as {filename}")
 
+        self._quit.set()
+        self._resume.set()
+        worker.join()
         cap.release()
         if out:
             out.release()
@@ -129,9 +218,17 @@ def main():
                         help='Output video path (optional)')
     parser.add_argument('--mark-zones', action='store_true',
                         help='Start in zone marking mode')
+    parser.add_argument('--export-engine', action='store_true',
+                        help='Export TensorRT engine calibrated on frames from source')
 
     args = parser.parse_args()
 
+    if args.export_engine:
+        print("Exporting TensorRT engine...")
+        engine_path = export_engine(args.source)
+        print(f"Engine saved as {engine_path}")
+        return
+
     monitor = RestrictedZoneMonitor()
 
     if args.mark_zones:
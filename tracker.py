@@ -1,5 +1,11 @@
+import os
 import cv2
+import json
+import shutil
+import tempfile
+import functools
 import numpy as np
+from dataclasses import dataclass
 from ultralytics import YOLO
 from deep_sort_realtime.deepsort_tracker import DeepSort
 from typing import List, Dict, Tuple
@@ -8,7 +14,10 @@ from config import Config
 
 class PersonTracker:
     def __init__(self):
-        self.yolo_model = YOLO(Config.YOLO_MODEL)
+        if Config.USE_CUDA and os.path.exists(Config.YOLO_ENGINE):
+            self.yolo_model = YOLO(Config.YOLO_ENGINE, task='detect')
+        else:
+            self.yolo_model = YOLO(Config.YOLO_MODEL)
         self.deepsort_tracker = DeepSort(
             max_age=Config.MAX_AGE,
             n_init=Config.MIN_HITS,
@@ -31,15 +40,16 @@ class PersonTracker:
             verbose=False
         )[0]
 
-        detections = []
-
-        for box in yolo_results.boxes:
-            if box.cls.item() == 0:  # person class
-                x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-                confidence = box.conf.item()
+        # Filter and convert all boxes at once with a single device transfer each
+        boxes = yolo_results.boxes
+        mask = boxes.cls == 0  # person class
+        xyxy = boxes.xyxy[mask].cpu().numpy().astype(int)
+        confidences = boxes.conf[mask].cpu().numpy()
+        ltwh = np.stack([xyxy[:, 0], xyxy[:, 1], xyxy[:, 2] - xyxy[:, 0],
+                         xyxy[:, 3] - xyxy[:, 1]], axis=1)
 
-                detections.append(
-                    ([x1, y1, x2 - x1, y2 - y1], confidence, 'person'))
+        detections = list(zip(ltwh.tolist(), confidences.tolist(),
+                              ['person'] * len(confidences)))
 
         # DeepSORT tracking
         tracks = self.deepsort_tracker.update_tracks(detections, frame=frame)
@@ -63,26 +73,133 @@ class PersonTracker:
         return results
 
 
+def export_engine(video_source: str, num_frames: int = Config.INT8_CALIBRATION_FRAMES) -> str:
+    """Export YOLO model to a TensorRT engine calibrated on frames from video source"""
+    with tempfile.TemporaryDirectory() as calib_dir:
+        images_dir = os.path.join(calib_dir, 'images')
+        os.makedirs(images_dir)
+
+        # Sample calibration frames evenly over the video
+        cap = cv2.VideoCapture(video_source)
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        step = max(1, total // num_frames) if total > 0 else 1
+        saved = 0
+        index = 0
+        while saved < num_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if index % step == 0:
+                cv2.imwrite(os.path.join(
+                    images_dir, f"{saved:04d}.jpg"), frame)
+                saved += 1
+            index += 1
+        cap.release()
+        if saved == 0:
+            raise ValueError("Could not read frames from source")
+
+        model = YOLO(Config.YOLO_MODEL)
+
+        # JSON is valid YAML, so the dataset description is written with json
+        data_path = os.path.join(calib_dir, 'calibration.yaml')
+        with open(data_path, 'w') as f:
+            json.dump({'path': calib_dir, 'train': 'images', 'val': 'images',
+                       'names': model.names}, f)
+
+        engine_path = model.export(
+            format='engine',
+            int8=Config.YOLO_INT8,
+            half=not Config.YOLO_INT8,
+            data=data_path,
+            imgsz=Config.IMG_SIZE,
+            device=0
+        )
+
+    if os.path.abspath(engine_path) != os.path.abspath(Config.YOLO_ENGINE):
+        shutil.move(engine_path, Config.YOLO_ENGINE)
+    return Config.YOLO_ENGINE
+
+
+@dataclass
+class ZoneOverlay:
+    """Zone fill rasterized once, cropped to the region zones cover on the frame"""
+    roi: Tuple[slice, slice]
+    fill: np.ndarray
+    fill_mask: np.ndarray
+    polys: List[np.ndarray]
+    label_positions: List[Tuple[int, int]]
+
+
+@functools.lru_cache(maxsize=1024)
+def _text_size(label: str) -> Tuple[int, int]:
+    """Get rendered size of track label text, cached since labels repeat across frames"""
+    return cv2.getTextSize(label, Config.FONT, Config.FONT_SCALE, Config.TEXT_THICKNESS)[0]
+
+
 class Visualization:
     @staticmethod
     def draw_zones(frame: np.ndarray, zones: List[List[Tuple[int, int]]]):
         """Draw restricted zones on frame"""
+        polys = Config.get_zone_polys_np(zones)
+        if not polys:
+            return
+
+        # Fill all zones on one overlay and blend it with the frame once.
+        # Zones are filled one by one so that overlapping zones stay filled
+        overlay = frame.copy()
+        for pts in polys:
+            cv2.fillPoly(overlay, [pts], Config.ZONE_COLOR)
+        cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
+        cv2.polylines(frame, polys, True, Config.ZONE_COLOR, 2)
+
+        # Add zone labels
         for zone in zones:
-            overlay = frame.copy()
-            pts = np.array(zone, np.int32)
-            cv2.fillPoly(frame, [pts], Config.ZONE_COLOR)
-            cv2.addWeighted(frame, 0.6, overlay, 0.4, 0, frame)
-            cv2.polylines(frame, [pts], True, Config.ZONE_COLOR, 2)
-
-            # Add zone label
             if len(zone) > 0:
                 label_pos = (zone[0][0], zone[0][1] - 10)
                 cv2.putText(frame, "Restricted Zone", label_pos,
                             Config.FONT, Config.FONT_SCALE, Config.ZONE_COLOR, Config.TEXT_THICKNESS)
 
     @staticmethod
-    def draw_tracks(frame: np.ndarray, tracks: List[Dict], alert_manager):
-        """Draw bounding boxes and IDs on frame with alarm status"""
+    def render_zone_overlay(shape: Tuple[int, ...], zones: List[List[Tuple[int, int]]]) -> ZoneOverlay:
+        """Rasterize restricted zones once for frames of the given shape"""
+        polys = Config.get_zone_polys_np(zones)
+        fill = np.zeros(shape, np.uint8)
+        fill_mask = np.zeros(shape[:2], np.uint8)
+
+        # Zones are filled one by one so that overlapping zones stay filled
+        for pts in polys:
+            cv2.fillPoly(fill, [pts], Config.ZONE_COLOR)
+            cv2.fillPoly(fill_mask, [pts], 255)
+
+        # Crop the fill to the area covered by zones
+        x, y, w, h = cv2.boundingRect(fill_mask)
+        roi = (slice(y, y + h), slice(x, x + w))
+        return ZoneOverlay(
+            roi=roi,
+            fill=fill[roi],
+            fill_mask=fill_mask[roi][..., None] > 0,
+            polys=polys,
+            label_positions=[(zone[0][0], zone[0][1] - 10)
+                             for zone in zones if len(zone) > 0]
+        )
+
+    @staticmethod
+    def apply_zone_overlay(frame: np.ndarray, overlay: ZoneOverlay):
+        """Draw prerendered restricted zones on frame"""
+        roi = frame[overlay.roi]
+        if roi.size > 0:
+            blended = cv2.addWeighted(overlay.fill, 0.6, roi, 0.4, 0)
+            np.copyto(roi, blended, where=overlay.fill_mask)
+
+        # Outlines and labels only touch a few pixels, so they are drawn directly
+        cv2.polylines(frame, overlay.polys, True, Config.ZONE_COLOR, 2)
+        for label_pos in overlay.label_positions:
+            cv2.putText(frame, "Restricted Zone", label_pos,
+                        Config.FONT, Config.FONT_SCALE, Config.ZONE_COLOR, Config.TEXT_THICKNESS)
+
+    @staticmethod
+    def draw_tracks(frame: np.ndarray, tracks: List[Dict], alert_manager, now: float = None):
+        """Draw bounding boxes and IDs on frame with alarm status at frame time now"""
         for track in tracks:
             track_id = track['track_id']
             bbox = track['bbox']
@@ -91,7 +208,7 @@ class Visualization:
 
             # Get alarm status
             is_alerted, time_remaining = alert_manager.get_alert_status(
-                track_id)
+                track_id, now=now)
 
             # Choose color based on alert status
             if is_alerted:
@@ -111,8 +228,7 @@ class Visualization:
 
             # Draw label background
             label = f"{status_text}"
-            label_size = cv2.getTextSize(
-                label, Config.FONT, Config.FONT_SCALE, Config.TEXT_THICKNESS)[0]
+            label_size = _text_size(label)
             cv2.rectangle(frame, (x1, y1 - label_size[1] - 10),
                           (x1 + label_size[0], y1), color, -1)
 
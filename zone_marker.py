@@ -8,6 +8,8 @@ class ZoneMarker:
     def __init__(self):
         self.current_zone_points: List[Tuple[int, int]] = []
         self.zones: List[List[Tuple[int, int]]] = []
+        # int32 vertex arrays of zones for drawing, kept in sync with self.zones
+        self._zones_np: List[np.ndarray] = []
         self.current_frame = None
         self.window_name = "Mark Restricted Zones: Left click: add points, Right click: finish zone, 'q' or Esc: quit, 'c': clear current point, 'd': delete last zone"
 
@@ -19,6 +21,8 @@ class ZoneMarker:
         elif event == cv2.EVENT_RBUTTONDOWN:
             if len(self.current_zone_points) >= 3:
                 self.zones.append(self.current_zone_points.copy())
+                self._zones_np.append(
+                    np.asarray(self.current_zone_points, np.int32))
                 self.current_zone_points = []
                 Config.save_zones(self.zones)
                 print(f"Zone saved. Total zones: {len(self.zones)}")
@@ -29,9 +33,8 @@ class ZoneMarker:
         temp_frame = self.current_frame.copy()
 
         # Draw existing zones
-        for zone in self.zones:
+        for pts in self._zones_np:
             overlay = temp_frame.copy()
-            pts = np.array(zone, np.int32)
             cv2.fillPoly(temp_frame, [pts], Config.ZONE_COLOR)
             cv2.addWeighted(temp_frame, 0.6, overlay, 0.4, 0, temp_frame)
             cv2.polylines(temp_frame, [pts],
@@ -68,6 +71,7 @@ class ZoneMarker:
                 raise ValueError("Could not read frame from source")
 
         self.zones = Config.load_zones()
+        self._zones_np = list(Config.get_zone_polys_np(self.zones))
         self.current_zone_points = []
 
         cv2.namedWindow(self.window_name)
@@ -88,6 +92,7 @@ class ZoneMarker:
             elif key == ord('d'):  # Delete last zone
                 if self.zones:
                     self.zones.pop()
+                    self._zones_np.pop()
                     Config.save_zones(self.zones)
                     print(f"Last zone deleted. Total zones: {len(self.zones)}")
 